@@ -1,6 +1,11 @@
 import networkx as nx
 import sympy as sym
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg
+import scipy.linalg
+import warnings
+from fractions import Fraction
 
 
 class Circuit():
@@ -72,6 +77,14 @@ class Circuit():
     R_units = 'kO'
     I_units = 'mA'
 
+    # Branch component formats, from the component str representation
+    FMT = {'V': lambda self, value: "(" + value + " " + self.V_units + ")",
+           'R': lambda self, value: "[" + value + " " + self.R_units + "]",
+           'I': lambda self, value: "\\" + value + " " + self.I_units + "\\"}
+
+    # Minimum number of branches for solving numeric circuits as sparse systems
+    sparse_threshold = 16
+
 
     # Constructor
     def __init__(self, edgelist = []):
@@ -79,27 +92,51 @@ class Circuit():
             Empty circuit by default. """
 
         self._circuit = nx.MultiGraph()
-        self._meshes = []
+        self._simple_meshes = []
+        self._parallel_pairs = []
+        self._solution_fn = None
+        self._sp_cache = {}
+        self._meshes_dirty = self._dirty = False # Outdated meshes and solution
+
+        # Structure-of-arrays mirror of the branches, one row per branch:
+        # edge as reported by the graph, node indexes, components and unknown code
+        self._node_idx = {}
+        self._edges, self._data = [], []
+        self._src, self._dst = [], []
+        self._V, self._R, self._I = [], [], []
+        self._unk_code = []
 
         # Add all branches
-        for edge in edgelist:
-            self.add_branch((edge[0], edge[1]), **(edge[2].copy()))
+        self.add_branches(edgelist)
 
 
     # Branch adder
     def add_branch(self, edge, **edgedict):
         """ Adds a new branch to the circuit. Also sets its 'R' and 'V' values. """
-        # Insertion preconditions + preprocessing
-        self.__order_between_nodes(edge)
-        self.__supported_dict_keys(edgedict)
-        self.__supported_value_types(edgedict)
+        self.add_branches([(edge[0], edge[1], edgedict)])
+
+
+    # Multiple branches adder
+    def add_branches(self, edgelist):
+        """ Adds a list of branches (nodeA, nodeB, components dictionary) to the
+        circuit. Its meshes and solution are only updated when read. """
+
+        # Insertion preconditions + preprocessing, for all branches
+        edgedicts = []
+        for edge in edgelist:
+            edgedict = edge[2].copy()
+            self.__order_between_nodes(edge)
+            self.__supported_dict_keys(edgedict)
+            self.__supported_value_types(edgedict)
+            edgedicts.append(edgedict)
 
         # Insertion
-        self._circuit.add_edge(edge[0], edge[1], **edgedict)
+        for edge, edgedict in zip(edgelist, edgedicts):
+            key = self._circuit.add_edge(edge[0], edge[1], **edgedict)
+            self.__row_append((edge[0], edge[1], key))
 
-        # Updates
-        self.__mesh_update()
-        self.__kirchhoff_update()
+        # Outdated meshes and solution
+        self._meshes_dirty = self._dirty = True
 
 
     def __order_between_nodes(self, edge):
@@ -124,22 +161,81 @@ class Circuit():
         else: raise AttributeError("Branch dictionary must have one and only one" +
                     " undefined key variable (the unknown).")
 
+        # Unknown as an integer code, for table-driven equation assembly
+        edgedict['unk_code'] = {'I': 0, 'V': 1, 'R': 2}[edgedict['unknown']]
+
 
     def __supported_value_types(self, edgedict):
-        """ Edge dictionary values must be converted to symbolic expression. """
-        if 'V' in edgedict: edgedict['V'] = sym.simplify(edgedict['V'])
-        if 'R' in edgedict: edgedict['R'] = sym.simplify(edgedict['R'])
-        if 'I' in edgedict: edgedict['I'] = sym.simplify(edgedict['I'])
+        """ Edge dictionary values must be converted to symbolic expression.
+        Only non numeric expressions are simplified. Also keeps their str
+        representations, for the circuit views. """
+        for component in ('V', 'R', 'I'):
+            if component in edgedict:
+                value = sym.sympify(edgedict[component])
+                if not value.is_number: value = sym.simplify(value)
+                edgedict[component] = value
+                edgedict['_' + component + '_str'] = str(value)
 
 
     # Branch deleter
     def del_branch(self, edge):
         """ Removes the branch specified from the circuit. Has to give a key. """
+        data = self._circuit.get_edge_data(edge[0], edge[1], edge[2])
         self._circuit.remove_edge(edge[0], edge[1], key = edge[2])
+        self.__row_remove(data['edge_row'])
+
+        # Outdated meshes and solution
+        self._meshes_dirty = self._dirty = True
+
+
+    # Branch rows
+    def __row_append(self, edge):
+        """ Appends a new row for the branch. Its edge keeps the nodes order
+        of the graph (the first inserted node first), as reported by it. """
+        for node in edge[:2]:
+            if node not in self._node_idx: self._node_idx[node] = len(self._node_idx)
+        if self._node_idx[edge[0]] > self._node_idx[edge[1]]: edge = (edge[1], edge[0], edge[2])
+
+        data = self._circuit.edges[edge]
+        data['edge_row'] = len(self._edges)
+        self._edges.append(edge)
+        self._data.append(data)
+        self._src.append(self._node_idx[edge[0]])
+        self._dst.append(self._node_idx[edge[1]])
+        self._V.append(data.get('V', sym.S.NaN))
+        self._R.append(data.get('R', sym.S.NaN))
+        self._I.append(data.get('I', sym.S.NaN))
+        self._unk_code.append(data['unk_code'])
+
+
+    def __row_remove(self, row):
+        """ Removes a branch row, by moving the last row into its place. """
+        rows = (self._edges, self._data, self._src, self._dst,
+                self._V, self._R, self._I, self._unk_code)
+        for values in rows:
+            values[row] = values[-1]
+            values.pop()
+        if row < len(self._edges): self._data[row]['edge_row'] = row
 
-        # Updates
-        self.__mesh_update()
-        self.__kirchhoff_update()
+
+    # Lazy updates
+    def _ensure_meshes(self):
+        """ Updates the meshes, only if the circuit has changed since the last time. """
+        if self._meshes_dirty: self.__mesh_update(); self._meshes_dirty = False
+
+
+    def _ensure_solved(self):
+        """ Solves the circuit, only if it has changed since the last time. """
+        self._ensure_meshes()
+        if self._dirty: self.__kirchhoff_update(); self._dirty = False
+
+
+    # Getter for solved
+    @property
+    def solved(self):
+        """ Getter for the circuit stability, if it has a unique solution. """
+        self._ensure_solved()
+        return self._solved
 
 
     # Getter for nodes
@@ -153,6 +249,7 @@ class Circuit():
     @property
     def branches(self):
         """ Getter for the edges dictionary of the circuit. """
+        self._ensure_solved()
         return dict(self._circuit.edges)
 
 
@@ -160,7 +257,9 @@ class Circuit():
     @property
     def meshes(self):
         """ Getter for the base cycles list of the circuit. """
-        return self._meshes
+        self._ensure_meshes()
+        return self._simple_meshes + [[(u, v, i), (v, u, j)]
+                                      for (u, v, i), (_, _, j) in self._parallel_pairs]
 
 
     # Voltage difference
@@ -168,25 +267,67 @@ class Circuit():
         """ Returns the pottential difference between nodeA and nodeB, as the
         pottential of nodeA with respect nodeB: V_AB = (V_A - V_B). """
 
+        for node in (nodeA, nodeB):
+            if node not in self._circuit: raise nx.NodeNotFound(
+            f"Node {node} is not in the circuit.")
+
+        if nodeA == nodeB: return sym.S.Zero # Same node, no path needed
+
+        self._ensure_solved()
         diff = 0
 
+        # Shortest paths from B, computed once until the circuit changes
+        if nodeB not in self._sp_cache:
+            self._sp_cache[nodeB] = nx.single_source_shortest_path(self._circuit, nodeB)
+
+        if nodeA not in self._sp_cache[nodeB]: raise nx.NetworkXNoPath(
+        f"No path between {nodeB} and {nodeA}.")
+
         # For all edges in a biconnected path from B to A,
-        nodes = nx.shortest_path(self._circuit, nodeB, nodeA)
+        nodes = self._sp_cache[nodeB][nodeA]
         for branch in [(nodes[i], nodes[i+1], 0) for i in range(len(nodes) - 1)]:
+            if not self._circuit.has_edge(*branch): continue # No branch with key 0
+            data = self._circuit.edges[branch]
 
-            # intensity direction
-            if branch in self.branches:
-                diff += self._circuit.edges[branch]['V']
-                diff -= self._circuit.edges[branch]['I'] * self._circuit.edges[branch]['R']
+            # intensity direction, as the graph reports its edges: the first
+            # inserted node first
+            if self._node_idx[branch[0]] < self._node_idx[branch[1]]:
+                diff += data['V'] - data['I'] * data['R']
 
             # intensity inverse direction
-            if (branch[1], branch[0], branch[2]) in self.branches:
-                diff -= self._circuit.edges[branch]['V']
-                diff += self._circuit.edges[branch]['I'] * self._circuit.edges[branch]['R']
+            else: diff -= data['V'] - data['I'] * data['R']
 
         return diff
 
 
+    # Solution evaluator
+    def evaluate(self, subs):
+        """ Returns the branches unknown values for the given symbol values,
+        as a dictionary {branch: value}. Symbols in subs can be given by name.
+
+        The circuit solution is lambdified with NumPy only once, so repeated
+        evaluations (parameter sweeps, or NumPy arrays as values) are cheap.
+        The function could also be JIT compiled with Numba, if ever needed. """
+
+        # Lambdified solution, until the circuit changes
+        self._ensure_solved()
+        if self._solution_fn is None:
+            self._solution_edges = list(self._circuit.edges)
+            solution = [self._circuit.edges[branch][self._circuit.edges[branch]['unknown']]
+                        for branch in self._solution_edges]
+            self._free_syms = sorted(set().union(*(value.free_symbols for value in solution)),
+                                     key = str)
+            self._solution_fn = sym.lambdify(self._free_syms, solution, 'numpy')
+
+        # Symbol values in the lambdified function order
+        subs = {str(symbol): value for symbol, value in subs.items()}
+        missing = [str(symbol) for symbol in self._free_syms if str(symbol) not in subs]
+        if missing: raise KeyError("Missing values for symbols: " + ", ".join(missing) + ".")
+
+        values = self._solution_fn(*[subs[str(symbol)] for symbol in self._free_syms])
+        return dict(zip(self._solution_edges, values))
+
+
     # Str representation
     def __str__(self):
         """ Shows the circuit as a pictographic drawing, by calling the
@@ -205,42 +346,34 @@ class Circuit():
         """ Full circuit view, prints nodes as column separators with
         homogeneous branches. Thinked for short circuits (4 or less nodes). """
 
-        node_idx = {node:i for i, node in enumerate(self.nodes)} # Index remembering
+        self._ensure_solved()
+        nodes = self.nodes
+        node_idx = {node:i for i, node in enumerate(nodes)} # Index remembering
         sep = "\t\t\t\t\t" # Separator between nodes
 
-        # Str representation. Default branch as default lines, for branch separations
-        circuit_pattern = sep.join([f"{node}" for node in self.nodes]) + "\n"
+        # Default branch as default lines, for branch separations
+        branch_pattern = [""] + [sep for node in nodes][:-1] + [""]
+        separator_line = "|".join(branch_pattern)
+
+        # Str representation, as a list of lines.
+        lines = [sep.join([f"{node}" for node in nodes])]
 
         # For each branch between nodes
-        for j, branch in enumerate(self._circuit.edges):
+        for branch, data in self._circuit.edges.items():
             # get the branch nodes index.
             min_idx = min(node_idx[branch[0]], node_idx[branch[1]])
             max_idx = max(node_idx[branch[0]], node_idx[branch[1]])
 
-            # Join and append branch components
-            branch_components = []
-            for component, value in self._circuit.edges[branch].items():
-                # If V is not the unknown
-                if component == 'V' and value:
-                    branch_components.append("(" + str(value) + " " + self.V_units + ")")
-                if component == 'R' and value:
-                    branch_components.append("[" + str(value) + " " + self.R_units + "]")
-                if component == 'I' and value:
-                    branch_components.append("\\" + str(value) + " " + self.I_units + "\\")
-            branch_components = "---".join(branch_components)
+            # Join branch components
+            branch_components = "---".join(self._format_components(data))
             branch_components = branch_components.center(40 * (max_idx - min_idx) - 1, "-")
 
-            # Add two default separator lines
-            branch_pattern = [""] + [sep for node in self.nodes][:-1] + [""]
-            circuit_pattern += "|".join(branch_pattern) + "\n"
-            circuit_pattern += "|".join(branch_pattern) + "\n"
+            # Add two default separator lines, and the branch line
+            lines += [separator_line, separator_line]
+            lines.append("|".join(branch_pattern[:min_idx + 1]) + "+" + branch_components
+                         + "+" + "|".join(branch_pattern[max_idx + 1:]))
 
-            # Add the branch line
-            circuit_pattern += "|".join(branch_pattern[:min_idx + 1])
-            circuit_pattern += "+" + branch_components + "+"
-            circuit_pattern += "|".join(branch_pattern[max_idx + 1:]) + "\n"
-
-        return circuit_pattern
+        return "\n".join(lines) + "\n"
 
 
     # Branches view
@@ -248,46 +381,130 @@ class Circuit():
         """ Simplified circuit view, as a row list of branches. Suitable for
         simbolic type circuits, or dense circuits (more than 4 nodes). """
 
-        circuit_pattern = "" # Str representation of the branches
+        self._ensure_solved()
+        lines = [] # Str representation of the branches
 
         # For each branch between nodes
-        for j, branch in enumerate(self._circuit.edges):
+        for branch, data in self._circuit.edges.items():
 
             # Join and append branch components
-            branch_components = []
-            for component, value in self._circuit.edges[branch].items():
-                # If V is not the unknown
-                if component == 'V' and value:
-                    branch_components.append("(" + str(value) + " " + self.V_units + ")")
-                if component == 'R' and value:
-                    branch_components.append("[" + str(value) + " " + self.R_units + "]")
-                if component == 'I' and value:
-                    branch_components.append("\\" + str(value) + " " + self.I_units + "\\")
-            branch_components = "--------".join(branch_components)
-            circuit_pattern += str(branch) + ": (" + str(branch[0]) + ")-------"
-            circuit_pattern += branch_components + "-------(" + str(branch[1]) + ")\n\n"
-        return circuit_pattern
+            branch_components = "--------".join(self._format_components(data))
+            lines.append(f"{branch}: ({branch[0]})-------{branch_components}-------({branch[1]})")
+
+        return "".join(line + "\n\n" for line in lines)
+
+
+    # Branch components formatter
+    def _format_components(self, data):
+        """ List of the str representations for the non-zero components
+        of a branch, in the branch dictionary order. Values are shown by
+        their cached str representations. """
+
+        components = []
+        for component, value in data.items():
+            fmt = self.FMT.get(component)
+            if fmt and value: components.append(fmt(self, data['_' + component + '_str']))
+        return components
 
 
     # Cycle base calculator
     def __mesh_update(self):
         """ Mesh update, every time that the circuit has changed.
-        Gets all the graph base cycles, combined with the multiple edge cycles.
+        Gets all the graph base cycles, combined with the multiple edge cycles,
+        kept apart as pairs of parallel branches.
         """
 
         # Get all base cycles for the undirect multiple graph as:
         self._base_circuit = nx.Graph(self._circuit)
-        self._meshes = []
+        self._simple_meshes = []
+        self._sp_cache = {} # Outdated shortest paths
 
         # the sum of all the base cycles for the undirect simple graph
-        for cycle in nx.cycle_basis(self._base_circuit):
-            self._meshes += [[(cycle[i-1], cycle[i], 0) for i in range(len(cycle))]]
-
-        # with all the inner cycles for the undirect multiple graph
-        for edge in self._base_circuit.edges:
-            n = len(self._circuit.adj[edge[0]][edge[1]])
-            self._meshes += [[(edge[0], edge[1], i), (edge[1], edge[0], i + 1)]
-                             for i in range(n - 1)]
+        for cycle in self.__fundamental_cycles():
+            self._simple_meshes += [[(cycle[i-1], cycle[i], 0) for i in range(len(cycle))]]
+
+        # with all the inner cycles for the undirect multiple graph, as pairs
+        # of parallel branches: the first one direct and the second one inverse
+        self._parallel_pairs = [((u, v, i), (u, v, i + 1)) for u, v in self._base_circuit.edges
+                                for i in range(len(self._circuit.adj[u][v]) - 1)]
+
+        # Meshes of each branch row, as (mesh, direction) pairs
+        row = {branch:j for j, branch in enumerate(self._edges)}
+        self._branch_meshes = [[] for branch in self._edges]
+        for k, mesh in enumerate(self._simple_meshes):
+            for branch in mesh:
+                if branch in row: self._branch_meshes[row[branch]].append((k, 1)) # direct
+                elif (branch[1], branch[0], branch[2]) in row: # inverse
+                    self._branch_meshes[row[(branch[1], branch[0], branch[2])]].append((k, -1))
+
+        # and rows of each pair of parallel branches (None if not in the circuit)
+        self._parallel_rows = [(row.get(a), row.get(b)) for a, b in self._parallel_pairs]
+
+
+    def __fundamental_cycles(self):
+        """ Base cycles of the undirect simple graph, as node lists. Each edge
+        out of a breadth-first spanning forest closes one cycle with the tree
+        path between its nodes. """
+
+        # Spanning forest, as the parent of each node (roots have none)
+        parent = {}
+        for component in nx.connected_components(self._base_circuit):
+            root = next(iter(component))
+            parent.update(nx.bfs_predecessors(self._base_circuit, root))
+
+        cycles = []
+        for u, v in self._base_circuit.edges:
+            if parent.get(u) == v or parent.get(v) == u: continue # tree edge
+
+            # Tree path from u to the root, and from v to the common ancestor
+            path_u = [u]
+            while path_u[-1] in parent: path_u.append(parent[path_u[-1]])
+            position = {node:i for i, node in enumerate(path_u)}
+            path_v = [v]
+            while path_v[-1] not in position: path_v.append(parent[path_v[-1]])
+
+            cycles.append(path_u[:position[path_v[-1]] + 1] + path_v[-2::-1])
+
+        return cycles
+
+
+    # Numeric circuit checker
+    def _is_fully_numeric(self):
+        """ True if every given branch value ('V', 'R' or 'I', except the
+        unknown) is a real number, with no free symbols on it. """
+        for values, code in ((self._I, 0), (self._V, 1), (self._R, 2)):
+            for value, unk_code in zip(values, self._unk_code):
+                if unk_code == code: continue
+                if value.free_symbols or not value.is_real: return False
+        return True
+
+
+    # Branch components
+    def __components(self, convert, zero):
+        """ Lists of the 'V', 'R' and 'I' values of the branch rows, converted
+        by the given function. The unknown of each branch is left as zero. """
+        return [[zero if unk_code == code else convert(value)
+                 for value, unk_code in zip(values, self._unk_code)]
+                for values, code in ((self._V, 1), (self._R, 2), (self._I, 0))]
+
+
+    # Numeric solution values
+    def __numeric_value(self, value):
+        """ SymPy number for a value of a numeric solution. Rationals with small
+        denominators are given exactly, as they are for integer branch values. """
+        if np.isfinite(value):
+            exact = Fraction(value).limit_denominator(1000)
+            if abs(value - exact) <= 1e-12 * max(1, abs(value)):
+                return sym.Rational(exact.numerator, exact.denominator)
+        return sym.Float(value)
+
+
+    # Singular numeric systems
+    def __singular(self, pivots):
+        """ True if a pivot of the LU factorization of A is zero, relative to
+        the biggest one, as for a matrix rank below E. """
+        pivots = np.abs(pivots)
+        return pivots.min() <= len(pivots) * np.finfo(float).eps * pivots.max()
 
 
     # Kirchhoff solver
@@ -296,78 +513,170 @@ class Circuit():
         the unknowed values for each branch. """
 
         # Number of nodes and edges.
-        N = len(self._circuit.nodes)
-        E = len(self._circuit.edges)
+        N = len(self._node_idx)
+        E = len(self._edges)
+
+        self._solution_fn = None # Outdated lambdified solution
+        if not E: self._solved = True; return # For empty circuits!!
 
-        if not E: return # For empty circuits!!
+        # Numeric circuits are solved with NumPy, symbolic ones with SymPy.
+        if self._is_fully_numeric():
+            self._solved, solution = self.__numeric_solve(N, E)
+        else:
+            self._solved, solution = self.__symbolic_solve(N, E)
+
+        # Adds the solutions back to branches
+        unknowns = ((self._I, 'I'), (self._V, 'V'), (self._R, 'R'))
+        for j, (data, unk_code) in enumerate(zip(self._data, self._unk_code)):
+            values, variable = unknowns[unk_code]
+            values[j] = solution[j] if self._solved else sym.S.NaN
+            data[variable] = values[j]
+            data['_' + variable + '_str'] = str(values[j])
+
+
+    def __numeric_solve(self, N, E):
+        """ Builds the linear system AX = B with NumPy arrays, as a dense or
+        sparse matrix depending on the circuit size, and solves it. """
+
+        K = min(N - 1, E) # number of node equations
+
+        # Branch rows as arrays
+        V, R, I = (np.array(values, dtype=float) for values in self.__components(float, 0.0))
+        codes = np.array(self._unk_code, dtype=np.int8)
+        src = np.array(self._src, dtype=int)
+        dst = np.array(self._dst, dtype=int)
+
+        # 2nd Kirchhoff Law (energy conservation), over the first E-K meshes:
+        # mesh-branch incidence as (mesh, branch, direction) triplets.
+        mesh_k, mesh_j, mesh_s = [], [], []
+        for j, meshes in enumerate(self._branch_meshes):
+            for k, s in meshes:
+                if k < E - K: mesh_k.append(k); mesh_j.append(j); mesh_s.append(s)
+
+        # Parallel branches close a mesh of their own, after the simple ones
+        M = len(self._simple_meshes)
+        for p, pair in enumerate(self._parallel_rows[:max(E - K - M, 0)]):
+            for j, s in zip(pair, (1, -1)):
+                if j is not None: mesh_k.append(M + p); mesh_j.append(j); mesh_s.append(s)
+        mesh_k = np.array(mesh_k, dtype=int) + K
+        mesh_j = np.array(mesh_j, dtype=int)
+        mesh_s = np.array(mesh_s, dtype=float)
+
+        # 1st Kirchhoff Law (charge conservation), over the first K nodes:
+        # intensity unknowns go to A, given intensities to B.
+        is_I = codes == 0
+        j_in = np.flatnonzero(dst < K)  # intensity in
+        j_out = np.flatnonzero(src < K) # intensity out
+        j_in_I, j_out_I = j_in[is_I[j_in]], j_out[is_I[j_out]]
+        rows = [dst[j_in_I], src[j_out_I]]
+        cols = [j_in_I, j_out_I]
+        vals = [np.ones(len(j_in_I)), -np.ones(len(j_out_I))]
+
+        B = np.zeros(E)
+        j_in_given, j_out_given = j_in[~is_I[j_in]], j_out[~is_I[j_out]]
+        np.add.at(B, dst[j_in_given], -I[j_in_given])
+        np.add.at(B, src[j_out_given], I[j_out_given])
+
+        # 2nd Kirchhoff Law: coefficients for the unknown ('I', 'V' or 'R')
+        # of each branch, with the mesh direction.
+        A_coef = np.choose(codes, [-R, np.ones(E), -I])
+        B_coef = np.choose(codes, [-V, R * I, -V])
+        rows.append(mesh_k); cols.append(mesh_j); vals.append(mesh_s * A_coef[mesh_j])
+        np.add.at(B, mesh_k, mesh_s * B_coef[mesh_j])
+
+        rows, cols, vals = np.concatenate(rows), np.concatenate(cols), np.concatenate(vals)
+
+        # Dense system for small circuits
+        if E < self.sparse_threshold:
+            A = np.zeros((E, E))
+            np.add.at(A, (rows, cols), vals)
+
+            # Undetermined (or incompatible) systems don't have a stable solution:
+            # a zero pivot in the LU factorization, as for a rank below E.
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', scipy.linalg.LinAlgWarning)
+                lu, piv = scipy.linalg.lu_factor(A)
+            if self.__singular(np.diag(lu)): return False, None
+            x = scipy.linalg.lu_solve((lu, piv), B)
+            return bool(np.isfinite(x).all()), [self.__numeric_value(x_j) for x_j in x]
+
+        # or sparse system for big ones
+        A = sp.coo_matrix((vals, (rows, cols)), shape=(E, E)).tocsc()
+
+        # Undetermined (or incompatible) systems don't have a stable solution:
+        # the same zero pivot test, over the SuperLU factorization.
+        try: lu = sp.linalg.splu(A)
+        except RuntimeError: return False, None # Exactly singular
+        if self.__singular(lu.U.diagonal()): return False, None
+        x = lu.solve(B)
+
+        return bool(np.isfinite(x).all()), [self.__numeric_value(x_j) for x_j in x]
+
+
+    def __symbolic_solve(self, N, E):
+        """ Builds the linear system AX = B with SymPy matrixes for circuits
+        with symbolic values, and solves it. """
+
+        K = min(N - 1, E) # number of node equations
 
         # Sympy matrixes for the lineal resulting system AX = B.
         A = sym.Matrix.zeros(E)
         B = sym.Matrix.zeros(E, 1)
         X = sym.symbols(f'x:{E}')
 
-        # Apply Kirchhoff laws to get the linear system
-        for i in range(E):
-            for j, branch in enumerate(self._circuit.edges):
-
-                # 1st Kirchhoff Law (charge conservation):
-                # the sum of currents meeting at a node is zero.
-                if i < (N - 1):
-                    if (branch[1] == list(self._circuit.nodes)[i]): # intensity in
-
-                        # Be sure of treating the correct unknown ('I', 'V' or 'R')
-                        if (self._circuit.edges[branch]['unknown'] == 'I'): A[i, j] = 1
-                        else: B[i] -= self._circuit.edges[branch]['I']
-
-                    if (branch[0] == list(self._circuit.nodes)[i]): # intensity out
-
-                        # Be sure of treating the correct unknown ('I', 'V' or 'R')
-                        if (self._circuit.edges[branch]['unknown'] == 'I'): A[i, j] = -1
-                        else: B[i] += self._circuit.edges[branch]['I']
-
-                # 2nd Kirchhoff Law (energy conservation):
-                # the directed sum of the voltages around any mesh is zero.
-                else:
-                    # direct branch
-                    if branch in self.meshes[i - (N - 1)]:
-
-                        # Be sure of treating the correct unknown ('I', 'V' or 'R')
-                        if (self._circuit.edges[branch]['unknown'] == 'I'):
-                            A[i, j] = - self._circuit.edges[branch]['R']
-                            B[i] -= self._circuit.edges[branch]['V']
-
-                        if (self._circuit.edges[branch]['unknown'] == 'V'):
-                            A[i, j] = 1
-                            B[i] += self._circuit.edges[branch]['R'] * self._circuit.edges[branch]['I']
-
-                        if (self._circuit.edges[branch]['unknown'] == 'R'):
-                            A[i, j] = - self._circuit.edges[branch]['I']
-                            B[i] -= self._circuit.edges[branch]['V']
-
-                    # inverse branch
-                    if (branch[1], branch[0], branch[2]) in self.meshes[i - (N - 1)]:
-
-                        # Be sure of treating the correct unknown ('I', 'V' or 'R')
-                        if (self._circuit.edges[branch]['unknown'] == 'I'):
-                            A[i, j] = self._circuit.edges[branch]['R']
-                            B[i] += self._circuit.edges[branch]['V']
-
-                        if (self._circuit.edges[branch]['unknown'] == 'V'):
-                            A[i, j] = -1
-                            B[i] -= self._circuit.edges[branch]['R'] * self._circuit.edges[branch]['I']
-
-                        if (self._circuit.edges[branch]['unknown'] == 'R'):
-                            A[i, j] = self._circuit.edges[branch]['I']
-                            B[i] += self._circuit.edges[branch]['V']
-
-        # Solves the linear system for symbolic coefficients
-        # or numeric values and gets the solution
-        solution_space = sym.linsolve((A, B), X)
-        self.solved = bool(solution_space)
-        for solution in solution_space: break
-
-        # Adds the solutions back to branches
-        for j, branch in enumerate(self._circuit.edges):
-            variable = self._circuit.edges[branch]['unknown']
-            if self.solved:  self._circuit.edges[branch][variable] = solution[j]
-            else:  self._circuit.edges[branch][variable] = sym.S.NaN
+        # Branch components as symbolic values
+        V, R, I = self.__components(sym.sympify, 0)
+
+        # KVL (A coefficient, B term) of each branch in a direct mesh,
+        # for the unknown ('I', 'V' or 'R') code of the branch
+        kvl_terms = (lambda j: (- R[j], - V[j]),
+                     lambda j: (1, R[j] * I[j]),
+                     lambda j: (- I[j], - V[j]))
+        terms = [kvl_terms[unk_code](j) for j, unk_code in enumerate(self._unk_code)]
+
+        # 1st Kirchhoff Law (charge conservation), over the first K nodes:
+        # the sum of currents meeting at a node is zero.
+        src, dst = self._src, self._dst
+        for j, unk_code in enumerate(self._unk_code):
+            if dst[j] < K: # intensity in
+
+                # Be sure of treating the correct unknown ('I', 'V' or 'R')
+                if (unk_code == 0): A[dst[j], j] = 1
+                else: B[dst[j]] -= I[j]
+
+            if src[j] < K: # intensity out
+
+                # Be sure of treating the correct unknown ('I', 'V' or 'R')
+                if (unk_code == 0): A[src[j], j] = -1
+                else: B[src[j]] += I[j]
+
+        # 2nd Kirchhoff Law (energy conservation), over the first E-K meshes:
+        # the directed sum of the voltages around any mesh is zero.
+        for j, meshes in enumerate(self._branch_meshes):
+            for k, s in meshes:
+                if k >= E - K: continue
+
+                # direct (s = 1) or inverse (s = -1) branch
+                A[K + k, j] = s * terms[j][0]
+                B[K + k] += s * terms[j][1]
+
+        # Parallel branches close a mesh of their own, after the simple ones:
+        # the voltage of the first one minus the voltage of the second one.
+        M = len(self._simple_meshes)
+        for i, (j_a, j_b) in enumerate(self._parallel_rows[:max(E - K - M, 0)], K + M):
+            if j_a is not None: A[i, j_a] = terms[j_a][0]; B[i] += terms[j_a][1]
+            if j_b is not None: A[i, j_b] = - terms[j_b][0]; B[i] -= terms[j_b][1]
+
+        # Solves the linear system for symbolic coefficients. A.LUsolve(B) is
+        # faster, but gives nested fractions that are even slower to simplify.
+        # The cost of linsolve depends a lot on the order of the unknowns, so
+        # its columns follow the graph edges order instead of the branch rows.
+        order = [data['edge_row'] for data in self._circuit.edges.values()]
+        solutions = sym.linsolve((A.extract(range(E), order), B), X)
+
+        # Undetermined (or incompatible) systems don't have a stable solution:
+        # no solution at all, or a family of them with free unknowns.
+        if solutions is sym.S.EmptySet: return False, None
+        (solution,) = solutions
+        if any(value.free_symbols & set(X) for value in solution): return False, None
+        return True, [solution[c] for c in np.argsort(order)]